@@ -3,6 +3,7 @@ EchoPilot Configuration Module
 Handles environment variables and application settings.
 """
 
+from functools import cached_property
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
@@ -37,13 +38,15 @@ class Settings(BaseSettings):
     # Audio Processing
     audio_sample_rate: int = 16000
     audio_chunk_duration: float = 0.5  # seconds
+    audio_silence_threshold: int = 150  # mean absolute 16-bit amplitude below which audio is skipped
     
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         extra = "ignore"
     
-    def get_llm_provider(self) -> str:
+    @cached_property
+    def llm_provider(self) -> str:
         """Determine which LLM provider to use based on available API keys."""
         if self.groq_api_key:
             return "groq"
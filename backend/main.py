@@ -3,13 +3,18 @@ EchoPilot Backend - Main Application
 Real-time AI interview assistant backend with FastAPI.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from config import settings
-from models.database import init_database
+from models.database import init_database, close_database
+from services.ai_generator import ai_generator
+from services.transcription import transcription_service
+from services.tts_service import tts_service
 from routers import cv_router, tts_router, history_router
 from websockets import handle_audio_websocket
 
@@ -29,10 +34,32 @@ async def lifespan(app: FastAPI):
     await init_database()
     logger.info("Database initialized")
     
+    try:
+        await asyncio.wait_for(ai_generator.warmup(), timeout=10.0)
+        logger.info("LLM client warmed up")
+    except Exception as e:
+        logger.warning(f"LLM client warmup failed: {e}")
+    
+    try:
+        await transcription_service.warmup()
+        logger.info("Transcription client warmed up")
+    except Exception as e:
+        logger.warning(f"Transcription client warmup failed: {e}")
+    
+    try:
+        await asyncio.wait_for(tts_service.warmup(), timeout=10.0)
+        logger.info("TTS voice catalog loaded")
+    except Exception as e:
+        logger.warning(f"TTS voice catalog preload failed: {e}")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down EchoPilot backend...")
+    await ai_generator.close()
+    await transcription_service.close()
+    await close_database()
+    logger.info("Database connection closed")
 
 
 # Create FastAPI app
@@ -40,7 +67,8 @@ app = FastAPI(
     title="EchoPilot",
     description="Real-time AI interview assistant",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -4,17 +4,129 @@ SQLite async database setup and CRUD operations.
 """
 
 import aiosqlite
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional, List
+from typing import AsyncIterator, Dict, Optional, List
 import json
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), "..", "echopilot.db")
 
+# How often buffered Q&A pairs are written out (seconds)
+QA_FLUSH_INTERVAL = 5.0
+
+# Connection-level settings applied once when the shared connection is opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Column order of the session SELECTs below; rows are zipped into dicts with these
+_SESSION_COLUMNS = ("id", "title", "cv_filename", "cv_text", "started_at", "ended_at", "question_count")
+_SUMMARY_COLUMNS = ("id", "title", "cv_filename", "started_at", "ended_at", "question_count")
+
+# CRUD statements. sqlite3 keeps a per-connection cache of prepared statements
+# keyed by SQL text, so with the shared connection each of these is parsed once.
+_SQL_CREATE_SESSION = """
+    INSERT INTO interview_sessions (title, cv_filename, cv_text)
+    VALUES (?, ?, ?)
+"""
+
+_SQL_END_SESSION = "UPDATE interview_sessions SET ended_at = CURRENT_TIMESTAMP WHERE id = ?"
+
+# Session row and its Q&A pairs in one round-trip; pairs come back as a JSON array
+_SQL_GET_SESSION = """
+    SELECT s.id, s.title, s.cv_filename, s.cv_text, s.started_at, s.ended_at, s.question_count, (
+        SELECT json_group_array(json_object(
+            'id', id,
+            'session_id', session_id,
+            'question', question,
+            'answer', answer,
+            'key_points', json(key_points),
+            'timestamp', timestamp
+        ))
+        FROM (
+            SELECT * FROM interview_qa
+            WHERE session_id = s.id
+            ORDER BY timestamp, id
+        )
+    ) AS qa_json
+    FROM interview_sessions s
+    WHERE s.id = ?
+"""
+
+_SQL_LIST_SESSIONS = """
+    SELECT id, title, cv_filename, started_at, ended_at, question_count
+    FROM interview_sessions
+    ORDER BY started_at DESC
+"""
+
+_SQL_DELETE_SESSION_QA = "DELETE FROM interview_qa WHERE session_id = ?"
+_SQL_DELETE_SESSION = "DELETE FROM interview_sessions WHERE id = ?"
+_SQL_DELETE_ALL_SESSIONS = "DELETE FROM interview_sessions"
+
+# timestamp is bound when the pair is queued, since rows are written later in batches
+_SQL_INSERT_QA = """
+    INSERT INTO interview_qa (session_id, question, answer, key_points, timestamp)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_ADD_QUESTION_COUNT = (
+    "UPDATE interview_sessions SET question_count = question_count + ? WHERE id = ?"
+)
+
+# Shared connection, opened by init_database() and kept for the process lifetime
+_db: Optional[aiosqlite.Connection] = None
+
+# SQLite serializes writes anyway; this keeps one writer transaction in flight at a time
+_write_lock = asyncio.Lock()
+
+# Q&A rows waiting to be written, keyed by session id
+_pending_qa: Dict[int, List[tuple]] = {}
+_flush_task: Optional[asyncio.Task] = None
+
+
+def _get_db() -> aiosqlite.Connection:
+    """Return the shared connection."""
+    if _db is None:
+        raise RuntimeError("Database not initialized. Call init_database() first.")
+    return _db
+
+
+@asynccontextmanager
+async def _transaction() -> AsyncIterator[aiosqlite.Connection]:
+    """Run a write on the shared connection, committing on success."""
+    db = _get_db()
+    async with _write_lock:
+        try:
+            yield db
+            await db.commit()
+        except BaseException:
+            # Includes cancellation, so a half-done write never rides along with the next commit
+            await db.rollback()
+            raise
+
 
 async def init_database():
-    """Initialize the database and create tables."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    """Open the shared connection, create tables and start the Q&A flusher."""
+    global _db, _flush_task
+
+    if _db is not None:
+        return
+
+    _db = await aiosqlite.connect(DATABASE_PATH)
+
+    for pragma in CONNECTION_PRAGMAS:
+        await _db.execute(pragma)
+
+    async with _transaction() as db:
         # Interview sessions table
         await db.execute("""
             CREATE TABLE IF NOT EXISTS interview_sessions (
@@ -23,10 +135,11 @@ async def init_database():
                 cv_filename TEXT,
                 cv_text TEXT,
                 started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                ended_at TIMESTAMP
+                ended_at TIMESTAMP,
+                question_count INTEGER DEFAULT 0
             )
         """)
-        
+
         # Question-Answer pairs table
         await db.execute("""
             CREATE TABLE IF NOT EXISTS interview_qa (
@@ -39,111 +152,171 @@ async def init_database():
                 FOREIGN KEY (session_id) REFERENCES interview_sessions(id) ON DELETE CASCADE
             )
         """)
-        
-        await db.commit()
+
+        # Databases created before question_count existed get the column and a backfill
+        async with db.execute("PRAGMA table_info(interview_sessions)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if "question_count" not in columns:
+            await db.execute(
+                "ALTER TABLE interview_sessions ADD COLUMN question_count INTEGER DEFAULT 0"
+            )
+            await db.execute("""
+                UPDATE interview_sessions SET question_count = (
+                    SELECT COUNT(*) FROM interview_qa WHERE session_id = interview_sessions.id
+                )
+            """)
+
+        # Indexes for the history list and per-session Q&A lookups
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_qa_session ON interview_qa(session_id)"
+        )
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_started ON interview_sessions(started_at DESC)"
+        )
+
+    _flush_task = asyncio.create_task(_flush_qa_periodically())
+
+
+async def close_database():
+    """Flush buffered Q&A pairs and close the shared connection."""
+    global _db, _flush_task
+
+    if _db is None:
+        return
+
+    if _flush_task:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    await flush_qa()
+
+    # Fold the WAL back into the main database file so it doesn't linger between runs
+    await _db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    await _db.close()
+    _db = None
 
 
 # Session CRUD operations
 async def create_session(title: Optional[str] = None, cv_filename: Optional[str] = None, cv_text: Optional[str] = None) -> int:
     """Create a new interview session."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        cursor = await db.execute(
-            """
-            INSERT INTO interview_sessions (title, cv_filename, cv_text, started_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (title, cv_filename, cv_text, datetime.utcnow())
-        )
-        await db.commit()
+    async with _transaction() as db:
+        cursor = await db.execute(_SQL_CREATE_SESSION, (title, cv_filename, cv_text))
         return cursor.lastrowid
 
 
 async def end_session(session_id: int) -> bool:
-    """Mark a session as ended."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute(
-            "UPDATE interview_sessions SET ended_at = ? WHERE id = ?",
-            (datetime.utcnow(), session_id)
-        )
-        await db.commit()
+    """Mark a session as ended, writing out its buffered Q&A pairs first."""
+    await flush_qa(session_id)
+    async with _transaction() as db:
+        await db.execute(_SQL_END_SESSION, (session_id,))
         return True
 
 
 async def get_session(session_id: int) -> Optional[dict]:
     """Get a session by ID with all Q&A pairs."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        
-        # Get session
-        async with db.execute(
-            "SELECT * FROM interview_sessions WHERE id = ?",
-            (session_id,)
-        ) as cursor:
-            session_row = await cursor.fetchone()
-            
-        if not session_row:
-            return None
-            
-        session = dict(session_row)
-        
-        # Get Q&A pairs
-        async with db.execute(
-            "SELECT * FROM interview_qa WHERE session_id = ? ORDER BY timestamp",
-            (session_id,)
-        ) as cursor:
-            qa_rows = await cursor.fetchall()
-            
-        session["qa_pairs"] = []
-        for row in qa_rows:
-            qa = dict(row)
-            if qa.get("key_points"):
-                qa["key_points"] = json.loads(qa["key_points"])
-            else:
-                qa["key_points"] = []
-            session["qa_pairs"].append(qa)
-            
-        return session
+    await flush_qa(session_id)
+    db = _get_db()
+
+    async with db.execute(_SQL_GET_SESSION, (session_id,)) as cursor:
+        session_row = await cursor.fetchone()
+
+    if not session_row:
+        return None
+
+    session = dict(zip(_SESSION_COLUMNS, session_row))
+    session["qa_pairs"] = json.loads(session_row[-1] or "[]")
+    for qa in session["qa_pairs"]:
+        if not qa["key_points"]:
+            qa["key_points"] = []
+
+    return session
 
 
 async def get_all_sessions() -> List[dict]:
     """Get all sessions with summary info."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        
-        async with db.execute("""
-            SELECT 
-                s.id, s.title, s.cv_filename, s.started_at, s.ended_at,
-                COUNT(q.id) as question_count
-            FROM interview_sessions s
-            LEFT JOIN interview_qa q ON s.id = q.session_id
-            GROUP BY s.id
-            ORDER BY s.started_at DESC
-        """) as cursor:
-            rows = await cursor.fetchall()
-            
-        return [dict(row) for row in rows]
+    await flush_qa()
+    db = _get_db()
+
+    async with db.execute(_SQL_LIST_SESSIONS) as cursor:
+        rows = await cursor.fetchall()
+
+    return [dict(zip(_SUMMARY_COLUMNS, row)) for row in rows]
 
 
 async def delete_session(session_id: int) -> bool:
     """Delete a session and its Q&A pairs."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute("DELETE FROM interview_qa WHERE session_id = ?", (session_id,))
-        await db.execute("DELETE FROM interview_sessions WHERE id = ?", (session_id,))
-        await db.commit()
+    _pending_qa.pop(session_id, None)
+    async with _transaction() as db:
+        await db.execute(_SQL_DELETE_SESSION_QA, (session_id,))
+        await db.execute(_SQL_DELETE_SESSION, (session_id,))
         return True
 
 
+async def delete_all_sessions() -> int:
+    """Delete every session in one transaction; Q&A pairs go via ON DELETE CASCADE."""
+    _pending_qa.clear()
+    async with _transaction() as db:
+        cursor = await db.execute(_SQL_DELETE_ALL_SESSIONS)
+        return cursor.rowcount
+
+
 # Q&A CRUD operations
-async def add_qa(session_id: int, question: str, answer: str, key_points: List[str] = None) -> int:
-    """Add a Q&A pair to a session."""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
-        key_points_json = json.dumps(key_points) if key_points else None
-        cursor = await db.execute(
-            """
-            INSERT INTO interview_qa (session_id, question, answer, key_points, timestamp)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (session_id, question, answer, key_points_json, datetime.utcnow())
-        )
-        await db.commit()
-        return cursor.lastrowid
+async def add_qa(session_id: int, question: str, answer: str, key_points: List[str] = None):
+    """
+    Queue a Q&A pair for a session.
+    
+    Pairs are written in batches by flush_qa(), every QA_FLUSH_INTERVAL
+    seconds and whenever the session is ended or read back.
+    """
+    key_points_json = json.dumps(key_points) if key_points else None
+    # Same UTC format as CURRENT_TIMESTAMP, so ordering matches rows written directly
+    timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+    _pending_qa.setdefault(session_id, []).append(
+        (session_id, question, answer, key_points_json, timestamp)
+    )
+
+
+async def flush_qa(session_id: Optional[int] = None) -> int:
+    """
+    Write buffered Q&A pairs for one session (or all sessions).
+    
+    Each session is written in its own transaction. Pairs for sessions that
+    were deleted in the meantime are dropped; on any other failure the pairs
+    go back into the buffer for the next flush.
+    """
+    session_ids = list(_pending_qa) if session_id is None else [session_id]
+    written = 0
+    
+    for sid in session_ids:
+        rows = _pending_qa.pop(sid, None)
+        if not rows:
+            continue
+        
+        try:
+            async with _transaction() as db:
+                await db.executemany(_SQL_INSERT_QA, rows)
+                await db.execute(_SQL_ADD_QUESTION_COUNT, (len(rows), sid))
+        except aiosqlite.IntegrityError:
+            logger.warning(f"Dropping {len(rows)} Q&A pairs for deleted session {sid}")
+            continue
+        except BaseException:
+            # Keep them ahead of anything queued while the write was in flight
+            _pending_qa[sid] = rows + _pending_qa.get(sid, [])
+            raise
+        
+        written += len(rows)
+    
+    return written
+
+
+async def _flush_qa_periodically():
+    """Background task that writes out buffered Q&A pairs."""
+    while True:
+        await asyncio.sleep(QA_FLUSH_INTERVAL)
+        try:
+            await flush_qa()
+        except Exception as e:
+            logger.error(f"Failed to flush Q&A pairs: {e}")
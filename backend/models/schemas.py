@@ -112,6 +112,9 @@ class InterviewSessionSummary(BaseModel):
 
 
 # WebSocket Models
+# These document the wire format. Outbound frames are built as plain dicts in
+# websockets/audio_handler.py and encoded with orjson, skipping model validation
+# on the per-frame send path; keep the two in sync.
 class WSMessage(BaseModel):
     """WebSocket message structure."""
     type: MessageType
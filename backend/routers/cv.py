@@ -5,6 +5,7 @@ Handles CV upload and context management.
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
+import os
 import uuid
 
 from models.schemas import CVUploadResponse, CVContext
@@ -16,6 +17,10 @@ router = APIRouter(prefix="/api/cv", tags=["CV"])
 # In production, this would be tied to user authentication
 DEFAULT_SESSION = "default"
 
+# Upload limits
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
 @router.post("/upload", response_model=CVUploadResponse)
 async def upload_cv(file: UploadFile = File(...)):
@@ -28,20 +33,21 @@ async def upload_cv(file: UploadFile = File(...)):
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
     
-    extension = "." + file.filename.lower().split(".")[-1] if "." in file.filename else ""
+    extension = os.path.splitext(file.filename)[1].lower()
     if extension not in CVProcessor.SUPPORTED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported file type. Supported: {', '.join(CVProcessor.SUPPORTED_EXTENSIONS)}"
         )
     
-    # Read file content
-    content = await file.read()
-    
-    if len(content) > 10 * 1024 * 1024:  # 10MB limit
-        raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB.")
+    # Read file content in chunks, bailing out as soon as the size limit is exceeded
+    content = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        content.extend(chunk)
+        if len(content) > MAX_UPLOAD_SIZE:
+            raise HTTPException(status_code=413, detail="File too large. Maximum size is 10MB.")
     
-    # Extract text
+    # Extract text; the extractors take the bytearray as-is, so the upload isn't copied again
     extracted_text, error = await CVProcessor.extract_text(content, file.filename)
     
     if error:
@@ -54,13 +60,13 @@ async def upload_cv(file: UploadFile = File(...)):
     summary = CVProcessor.create_summary(extracted_text)
     
     # Store context
-    cv_context_manager.set_context(DEFAULT_SESSION, file.filename, extracted_text, summary)
+    context = cv_context_manager.set_context(DEFAULT_SESSION, file.filename, extracted_text, summary)
     
     return CVUploadResponse(
         success=True,
         message="CV uploaded and processed successfully",
         filename=file.filename,
-        extracted_text=extracted_text[:500] + "..." if len(extracted_text) > 500 else extracted_text,
+        extracted_text=context.upload_preview,
         summary=summary
     )
 
@@ -75,10 +81,10 @@ async def get_cv_context():
     
     return CVContext(
         has_cv=True,
-        filename=context["filename"],
-        extracted_text=context["text"][:1000] + "..." if len(context["text"]) > 1000 else context["text"],
-        summary=context["summary"],
-        uploaded_at=context["uploaded_at"]
+        filename=context.filename,
+        extracted_text=context.preview,
+        summary=context.summary,
+        uploaded_at=context.uploaded_at
     )
 
 
@@ -97,4 +103,4 @@ async def get_full_cv_text():
     if not context:
         raise HTTPException(status_code=404, detail="No CV uploaded")
     
-    return {"text": context["text"]}
+    return {"text": context.text}
@@ -10,7 +10,8 @@ from models.schemas import InterviewSession, InterviewSessionSummary
 from models.database import (
     get_all_sessions,
     get_session,
-    delete_session
+    delete_session,
+    delete_all_sessions
 )
 
 router = APIRouter(prefix="/api/history", tags=["History"])
@@ -50,9 +51,6 @@ async def delete_interview_session(session_id: int):
 @router.delete("")
 async def clear_all_sessions():
     """Delete all interview sessions."""
-    sessions = await get_all_sessions()
-    
-    for session in sessions:
-        await delete_session(session["id"])
+    count = await delete_all_sessions()
     
-    return {"success": True, "message": f"Deleted {len(sessions)} sessions"}
+    return {"success": True, "message": f"Deleted {count} sessions"}
@@ -4,14 +4,18 @@ Handles text-to-speech conversion endpoints.
 """
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 import io
+import orjson
 
 from models.schemas import TTSRequest, TTSVoice
 from services.tts_service import tts_service
 
 router = APIRouter(prefix="/api/tts", tags=["TTS"])
 
+# The recommended voices are a static table, so serialize them once
+_RECOMMENDED_VOICES_JSON = orjson.dumps(tts_service.RECOMMENDED_VOICES)
+
 
 @router.post("/speak")
 async def text_to_speech(request: TTSRequest):
@@ -56,17 +60,13 @@ async def text_to_speech_stream(request: TTSRequest):
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
     
-    async def audio_generator():
-        async for chunk in tts_service.synthesize_stream(
+    return StreamingResponse(
+        tts_service.synthesize_stream(
             text=request.text,
             voice=request.voice,
             rate=request.rate,
             volume=request.volume
-        ):
-            yield chunk
-    
-    return StreamingResponse(
-        audio_generator(),
+        ),
         media_type="audio/mpeg"
     )
 
@@ -79,14 +79,16 @@ async def get_available_voices(locale: str = "en"):
     Args:
         locale: Filter by locale prefix (default: "en" for English)
     """
+    # The service keeps the catalog in memory, indexed by language
     try:
         voices = await tts_service.get_available_voices(locale_filter=locale)
-        return [TTSVoice(**v) for v in voices]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get voices: {str(e)}")
+    
+    return [TTSVoice(**v) for v in voices]
 
 
 @router.get("/voices/recommended")
 async def get_recommended_voices():
     """Get list of recommended high-quality voices."""
-    return tts_service.RECOMMENDED_VOICES
+    return Response(content=_RECOMMENDED_VOICES_JSON, media_type="application/json")
@@ -4,6 +4,7 @@ Context-aware answer generation using LLM (Groq/OpenAI).
 """
 
 import asyncio
+import httpx
 from typing import Optional, AsyncGenerator, List, Tuple
 import logging
 import json
@@ -13,6 +14,16 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Simple heuristics to detect questions: a question mark or a common question phrase
+_QUESTION_RE = re.compile(
+    r"\?|\b(?:tell me|describe|explain|what|how|why|where|when|can you|could you|would you)\b",
+    re.IGNORECASE
+)
+
+# Bullet lines ("- point" or "• point") in the KEY POINTS section. The marker run
+# can't backtrack, so separator lines like "---" are skipped rather than read as "-".
+_BULLET_RE = re.compile(r"^[^\S\n]*[-•]+(?![-•])[^\S\n]*(\S[^\n]*?)\s*$", re.MULTILINE)
+
 
 class AIGenerator:
     """Generate context-aware interview answers using LLM."""
@@ -46,26 +57,46 @@ KEY POINTS:
         self.provider = None
         self._initialized = False
     
-    async def initialize(self):
+    def initialize(self):
         """Initialize the LLM client."""
         if self._initialized:
             return
         
-        self.provider = settings.get_llm_provider()
+        self.provider = settings.llm_provider
+        
+        # Long-lived HTTP/2 pool so back-to-back answers reuse the TLS connection
+        http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60)
+        )
         
         if self.provider == "groq":
             from groq import AsyncGroq
-            self.client = AsyncGroq(api_key=settings.groq_api_key)
+            self.client = AsyncGroq(api_key=settings.groq_api_key, http_client=http_client)
             self.model = "llama-3.1-70b-versatile"
             logger.info("Initialized Groq client")
         else:
             from openai import AsyncOpenAI
-            self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+            self.client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
             self.model = "gpt-4o-mini"
             logger.info("Initialized OpenAI client")
         
         self._initialized = True
     
+    async def warmup(self):
+        """Initialize the client and open a pooled connection before the first question."""
+        self.initialize()
+        # One short attempt: startup shouldn't wait out the SDK's retries on an unreachable API
+        await self.client.with_options(timeout=5.0, max_retries=0).models.list()
+    
+    async def close(self):
+        """Close the LLM client and its connection pool."""
+        if self.client:
+            await self.client.close()
+            self.client = None
+            self._initialized = False
+    
     def _build_user_prompt(self, question: str, cv_context: Optional[str], role_context: Optional[str] = None) -> str:
         """Build the user prompt with context."""
         prompt_parts = []
@@ -80,7 +111,7 @@ KEY POINTS:
         
         return "\n---\n".join(prompt_parts)
     
-    def _parse_response(self, response_text: str) -> Tuple[str, List[str]]:
+    def parse_response(self, response_text: str) -> Tuple[str, List[str]]:
         """Parse the LLM response into answer and key points."""
         answer = response_text
         key_points = []
@@ -92,15 +123,8 @@ KEY POINTS:
             answer = answer_part
             
             if len(parts) > 1:
-                points_text = parts[1].strip()
                 # Extract bullet points
-                lines = points_text.split("\n")
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith("-") or line.startswith("•"):
-                        point = line.lstrip("-•").strip()
-                        if point:
-                            key_points.append(point)
+                key_points = _BULLET_RE.findall(parts[1])
         
         # Fallback: if no key points found, extract some from the answer
         if not key_points and answer:
@@ -121,7 +145,7 @@ KEY POINTS:
         Returns:
             Tuple of (answer_text, key_points)
         """
-        await self.initialize()
+        self.initialize()
         
         user_prompt = self._build_user_prompt(question, cv_context, role_context)
         
@@ -137,7 +161,7 @@ KEY POINTS:
             )
             
             response_text = response.choices[0].message.content
-            return self._parse_response(response_text)
+            return self.parse_response(response_text)
             
         except Exception as e:
             logger.error(f"Error generating answer: {e}")
@@ -155,7 +179,7 @@ KEY POINTS:
         Yields:
             Tuple of (text_chunk, is_complete)
         """
-        await self.initialize()
+        self.initialize()
         
         user_prompt = self._build_user_prompt(question, cv_context, role_context)
         
@@ -184,18 +208,15 @@ KEY POINTS:
             logger.error(f"Error in streaming answer: {e}")
             yield f"Error generating answer: {str(e)}", True
     
-    async def extract_question(self, transcription: str) -> Optional[str]:
+    def extract_question(self, transcription: str) -> Optional[str]:
         """
         Extract and clean up an interview question from transcription.
         Uses simple heuristics - could be enhanced with LLM.
         """
-        # Simple heuristics to detect questions
-        question_indicators = ["?", "tell me", "describe", "explain", "what", "how", "why", "where", "when", "can you", "could you", "would you"]
-        
         text = transcription.strip()
         
         # Check if it looks like a question
-        is_question = text.endswith("?") or any(ind in text.lower() for ind in question_indicators)
+        is_question = bool(_QUESTION_RE.search(text))
         
         if is_question and len(text) > 10:
             return text
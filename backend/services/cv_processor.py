@@ -3,78 +3,120 @@ EchoPilot CV/Resume Processing Service
 Handles extraction of text from PDF, DOCX, and TXT files.
 """
 
+import asyncio
 import io
-from typing import Optional, Tuple
-from PyPDF2 import PdfReader
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple, Union
+import fitz  # PyMuPDF
 from docx import Document
+from docx.oxml.ns import qn
+
+# Dedicated, bounded pool for CV parsing so a burst of uploads can't take over
+# the default executor threads that the rest of the app relies on
+_extraction_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cv-extract")
+
+# WordprocessingML tags used when walking a DOCX body
+_W_P, _W_TBL, _W_TR, _W_TC = qn("w:p"), qn("w:tbl"), qn("w:tr"), qn("w:tc")
+
+# Text-bearing run content of a paragraph, the same nodes python-docx's Paragraph.text
+# reads: only runs directly in the paragraph or its hyperlinks, so text boxes anchored
+# in a run's drawing (and their mc:Fallback copies) are left out
+_RUN_CONTENT = "*[self::w:t or self::w:tab or self::w:br or self::w:cr or self::w:noBreakHyphen or self::w:ptab]"
+_PARAGRAPH_TEXT_XPATH = f"./w:r/{_RUN_CONTENT} | ./w:hyperlink/w:r/{_RUN_CONTENT}"
+
+
+def _paragraph_text(p) -> str:
+    """Text of a <w:p> element; python-docx's element classes render tabs, breaks etc."""
+    return "".join(str(node) for node in p.xpath(_PARAGRAPH_TEXT_XPATH))
 
 
 class CVProcessor:
     """Process and extract text from CV/Resume files."""
     
-    SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
-    
     @staticmethod
-    async def extract_text(file_content: bytes, filename: str) -> Tuple[str, Optional[str]]:
+    async def extract_text(file_content: Union[bytes, bytearray], filename: str) -> Tuple[str, Optional[str]]:
         """
         Extract text from a file.
         
         Args:
-            file_content: Raw file bytes
+            file_content: Raw file bytes (bytes or bytearray)
             filename: Original filename to determine type
             
         Returns:
             Tuple of (extracted_text, error_message)
         """
-        extension = "." + filename.lower().split(".")[-1] if "." in filename else ""
+        extension = os.path.splitext(filename)[1].lower()
+        extractor = CVProcessor._EXTRACTORS.get(extension)
         
-        if extension not in CVProcessor.SUPPORTED_EXTENSIONS:
+        if extractor is None:
             return "", f"Unsupported file type: {extension}"
         
         try:
-            if extension == ".pdf":
-                return CVProcessor._extract_from_pdf(file_content), None
-            elif extension in {".docx", ".doc"}:
-                return CVProcessor._extract_from_docx(file_content), None
-            elif extension == ".txt":
-                return file_content.decode("utf-8", errors="ignore"), None
-            else:
-                return "", f"Unsupported file type: {extension}"
+            # Parsing is CPU-bound; run it in a worker thread so the event loop stays free
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(_extraction_executor, extractor, file_content)
+            return text, None
         except Exception as e:
             return "", f"Error extracting text: {str(e)}"
     
     @staticmethod
     def _extract_from_pdf(content: bytes) -> str:
         """Extract text from PDF file."""
-        reader = PdfReader(io.BytesIO(content))
         text_parts = []
         
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
+        with fitz.open(stream=content, filetype="pdf") as doc:
+            for page in doc:
+                page_text = page.get_text("text")
+                if page_text:
+                    text_parts.append(page_text)
         
         return "\n\n".join(text_parts)
     
     @staticmethod
     def _extract_from_docx(content: bytes) -> str:
         """Extract text from DOCX file."""
-        doc = Document(io.BytesIO(content))
+        # Walk the body XML directly; python-docx's Paragraph/Table/_Cell proxies
+        # re-query the tree on every access, which gets slow on large tables
+        body = Document(io.BytesIO(content)).element.body
         text_parts = []
         
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text_parts.append(paragraph.text)
+        for p in body.iterchildren(_W_P):
+            paragraph_text = _paragraph_text(p)
+            if paragraph_text.strip():
+                text_parts.append(paragraph_text)
         
         # Also extract from tables
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = " | ".join(cell.text.strip() for cell in row.cells if cell.text.strip())
+        for tbl in body.iterchildren(_W_TBL):
+            for tr in tbl.iterchildren(_W_TR):
+                cells = (
+                    "\n".join(_paragraph_text(p) for p in tc.iterchildren(_W_P)).strip()
+                    for tc in tr.iterchildren(_W_TC)
+                )
+                row_text = " | ".join(cell for cell in cells if cell)
                 if row_text:
                     text_parts.append(row_text)
         
         return "\n".join(text_parts)
     
+    @staticmethod
+    def _extract_from_txt(content: bytes) -> str:
+        """Extract text from TXT file."""
+        return content.decode("utf-8", errors="ignore")
+    
+    # Extractor for each supported file extension
+    _EXTRACTORS = {
+        ".pdf": _extract_from_pdf,
+        ".docx": _extract_from_docx,
+        ".doc": _extract_from_docx,
+        ".txt": _extract_from_txt,
+    }
+    
+    SUPPORTED_EXTENSIONS = frozenset(_EXTRACTORS)
+    
     @staticmethod
     def create_summary(text: str, max_length: int = 2000) -> str:
         """
@@ -84,40 +126,72 @@ class CVProcessor:
         if len(text) <= max_length:
             return text
         
-        # Try to truncate at a sentence boundary
-        truncated = text[:max_length]
-        last_period = truncated.rfind(".")
-        if last_period > max_length * 0.7:
-            return truncated[:last_period + 1]
+        # Try to truncate at a sentence boundary in the last 30% of the allowed length
+        last_period = text.rfind(".", int(max_length * 0.7) + 1, max_length)
+        if last_period != -1:
+            return text[:last_period + 1]
         
-        return truncated + "..."
+        return text[:max_length] + "..."
+    
+    @staticmethod
+    def create_preview(text: str, max_length: int) -> str:
+        """Truncate text for display, marking the cut with an ellipsis."""
+        if len(text) <= max_length:
+            return text
+        return text[:max_length] + "..."
+
+
+@dataclass(slots=True)
+class CVContextEntry:
+    """Stored CV context for one session."""
+    filename: str
+    text: str
+    summary: str
+    preview: str
+    upload_preview: str
+    uploaded_at: datetime
 
 
 # Global CV context storage (in production, use Redis or database)
 class CVContextManager:
-    """Manages CV context for sessions."""
+    """Manages CV context for sessions, keeping the most recently used ones."""
+    
+    # Preview lengths for the context endpoint and the upload response
+    PREVIEW_LENGTH = 1000
+    UPLOAD_PREVIEW_LENGTH = 500
+    
+    # Maximum number of sessions whose CV context is kept in memory
+    MAX_CONTEXTS = 128
     
     def __init__(self):
-        self._contexts = {}
+        self._contexts: OrderedDict[str, CVContextEntry] = OrderedDict()
     
-    def set_context(self, session_id: str, filename: str, text: str, summary: str = None):
-        """Store CV context for a session."""
-        from datetime import datetime
-        self._contexts[session_id] = {
-            "filename": filename,
-            "text": text,
-            "summary": summary or CVProcessor.create_summary(text),
-            "uploaded_at": datetime.utcnow()
-        }
+    def set_context(self, session_id: str, filename: str, text: str, summary: str = None) -> CVContextEntry:
+        """Store CV context for a session, precomputing the display previews."""
+        context = CVContextEntry(
+            filename=filename,
+            text=text,
+            summary=summary or CVProcessor.create_summary(text),
+            preview=CVProcessor.create_preview(text, self.PREVIEW_LENGTH),
+            upload_preview=CVProcessor.create_preview(text, self.UPLOAD_PREVIEW_LENGTH),
+            uploaded_at=datetime.utcnow()
+        )
+        self._contexts[session_id] = context
+        self._contexts.move_to_end(session_id)
+        if len(self._contexts) > self.MAX_CONTEXTS:
+            self._contexts.popitem(last=False)
+        return context
     
-    def get_context(self, session_id: str) -> Optional[dict]:
+    def get_context(self, session_id: str) -> Optional[CVContextEntry]:
         """Get CV context for a session."""
-        return self._contexts.get(session_id)
+        context = self._contexts.get(session_id)
+        if context is not None:
+            self._contexts.move_to_end(session_id)
+        return context
     
     def clear_context(self, session_id: str):
         """Clear CV context for a session."""
-        if session_id in self._contexts:
-            del self._contexts[session_id]
+        self._contexts.pop(session_id, None)
     
     def has_context(self, session_id: str) -> bool:
         """Check if session has CV context."""
@@ -6,12 +6,9 @@ Real-time speech-to-text using Groq Whisper API.
 import asyncio
 import httpx
 import numpy as np
-from typing import Optional, Tuple
-import io
-import wave
+from typing import Callable, Optional, Tuple, Union
 import logging
-import tempfile
-import os
+import struct
 
 from config import settings
 
@@ -25,21 +22,35 @@ class TranscriptionService:
         """Initialize the transcription service."""
         self.api_key = settings.groq_api_key
         self.api_url = "https://api.groq.com/openai/v1/audio/transcriptions"
+        self.models_url = "https://api.groq.com/openai/v1/models"
         self._client = None
     
-    async def _get_client(self) -> httpx.AsyncClient:
+    def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None:
             self._client = httpx.AsyncClient(timeout=30.0)
         return self._client
     
-    async def transcribe(self, audio_data: bytes, sample_rate: int = 16000) -> Tuple[str, float]:
+    async def warmup(self):
+        """Create the HTTP client and open a connection to the API before the first chunk."""
+        if not self.api_key:
+            raise ValueError("GROQ_API_KEY not configured")
+        
+        client = self._get_client()
+        await client.get(
+            self.models_url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=5.0,
+        )
+    
+    async def transcribe(self, audio_data: Union[bytes, bytearray], sample_rate: int = 16000, prompt: Optional[str] = None) -> Tuple[str, float]:
         """
         Transcribe audio data using Groq Whisper API.
         
         Args:
-            audio_data: Raw PCM audio bytes (16-bit, mono)
+            audio_data: Raw PCM audio (16-bit, mono), bytes or bytearray
             sample_rate: Audio sample rate
+            prompt: Text decoded just before this audio, used by Whisper for continuity
             
         Returns:
             Tuple of (transcribed_text, confidence)
@@ -47,6 +58,11 @@ class TranscriptionService:
         if len(audio_data) < 1000:  # Too short
             return "", 0.0
         
+        # Skip silent buffers before paying for an API round-trip
+        samples = np.frombuffer(audio_data, dtype=np.int16, count=len(audio_data) // 2)
+        if np.abs(samples, dtype=np.int32).mean() < settings.audio_silence_threshold:
+            return "", 0.0
+        
         if not self.api_key:
             logger.error("GROQ_API_KEY not configured")
             return "", 0.0
@@ -55,7 +71,7 @@ class TranscriptionService:
             # Convert raw PCM to WAV format for the API
             wav_data = self._pcm_to_wav(audio_data, sample_rate)
             
-            client = await self._get_client()
+            client = self._get_client()
             
             # Send to Groq Whisper API
             files = {
@@ -66,6 +82,8 @@ class TranscriptionService:
                 "language": "en",
                 "response_format": "json",
             }
+            if prompt:
+                data["prompt"] = prompt
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
             }
@@ -90,15 +108,14 @@ class TranscriptionService:
             return "", 0.0
     
     def _pcm_to_wav(self, pcm_data: bytes, sample_rate: int) -> bytes:
-        """Convert raw PCM data to WAV format."""
-        buffer = io.BytesIO()
-        with wave.open(buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)  # Mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(pcm_data)
-        buffer.seek(0)
-        return buffer.read()
+        """Convert raw PCM data (16-bit, mono) to WAV format by prepending a header."""
+        header = struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + len(pcm_data), b"WAVE",
+            b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,  # PCM, mono, 16-bit
+            b"data", len(pcm_data)
+        )
+        return header + pcm_data
     
     async def close(self):
         """Close the HTTP client."""
@@ -107,5 +124,88 @@ class TranscriptionService:
             self._client = None
 
 
+class WebMDecoder:
+    """
+    Long-running ffmpeg process that decodes one continuous WebM stream to PCM.
+    
+    MediaRecorder only sends the WebM header with its first chunk, so later
+    chunks can't be decoded on their own. Feeding the whole stream into one
+    ffmpeg process also avoids a fork/exec per chunk.
+    """
+    
+    READ_SIZE = 64 * 1024
+    
+    def __init__(self, on_pcm: Callable[[bytes], None], sample_rate: int = 16000):
+        """
+        Args:
+            on_pcm: Called with each block of decoded PCM (16-bit, mono)
+            sample_rate: Output sample rate
+        """
+        self._on_pcm = on_pcm
+        self.sample_rate = sample_rate
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._error_logger: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Spawn ffmpeg. Raises FileNotFoundError if ffmpeg is not installed."""
+        self._process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-loglevel", "error",
+            "-f", "webm", "-i", "pipe:0",
+            "-ar", str(self.sample_rate), "-ac", "1", "-f", "s16le",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._reader = asyncio.create_task(self._read_output())
+        self._error_logger = asyncio.create_task(self._log_errors())
+    
+    async def _read_output(self):
+        """Forward decoded PCM to the callback until ffmpeg closes stdout."""
+        while True:
+            chunk = await self._process.stdout.read(self.READ_SIZE)
+            if not chunk:
+                break
+            self._on_pcm(chunk)
+    
+    async def _log_errors(self):
+        """Log whatever ffmpeg reports on stderr (only errors, given -loglevel error)."""
+        async for line in self._process.stderr:
+            message = line.decode(errors="ignore").strip()
+            if message:
+                logger.warning(f"ffmpeg: {message}")
+    
+    async def feed(self, webm_data: bytes):
+        """Write encoded audio to ffmpeg. Raises ConnectionError if ffmpeg has exited."""
+        self._process.stdin.write(webm_data)
+        await self._process.stdin.drain()
+    
+    async def close(self):
+        """Close ffmpeg's input and wait for the remaining PCM to be delivered."""
+        if self._process is None:
+            return
+        
+        if not self._process.stdin.is_closing():
+            self._process.stdin.close()
+        
+        try:
+            await asyncio.wait_for(self._reader, timeout=5.0)
+        except asyncio.TimeoutError:
+            logger.warning("ffmpeg did not finish in time; killing it")
+            self._process.kill()
+        except Exception as e:
+            logger.error(f"ffmpeg reader error: {e}")
+        
+        await self._process.wait()
+        try:
+            await asyncio.wait_for(self._error_logger, timeout=1.0)
+        except Exception:
+            self._error_logger.cancel()
+        self._process = None
+        self._reader = None
+        self._error_logger = None
+
+
 # Global instance
 transcription_service = TranscriptionService()
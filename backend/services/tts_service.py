@@ -5,6 +5,8 @@ Natural voice output using edge-tts (Microsoft Edge TTS).
 
 import asyncio
 import edge_tts
+import hashlib
+from collections import OrderedDict
 from typing import Optional, List, AsyncGenerator
 import io
 import logging
@@ -27,6 +29,10 @@ class TTSService:
         "en-GB-RyanNeural": {"name": "Ryan", "gender": "Male", "style": "British, friendly"},
     }
     
+    # Limits for the in-memory cache of synthesized audio
+    AUDIO_CACHE_SIZE = 256
+    AUDIO_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    
     def __init__(self, default_voice: str = None):
         """
         Initialize TTS service.
@@ -37,7 +43,29 @@ class TTSService:
         self.default_voice = default_voice or settings.tts_voice
         self.default_rate = settings.tts_rate
         self.default_volume = settings.tts_volume
-        self._voices_cache = None
+        self._voices_cache: Optional[List[dict]] = None
+        self._voices_by_language: dict[str, List[dict]] = {}
+        self._audio_cache: OrderedDict[bytes, bytes] = OrderedDict()
+        self._audio_cache_bytes = 0
+    
+    @staticmethod
+    def _audio_cache_key(text: str, voice: str, rate: str, volume: str) -> bytes:
+        """Hash the synthesis parameters into a compact cache key."""
+        return hashlib.blake2b(
+            "\0".join((text, voice, rate, volume)).encode(),
+            digest_size=16
+        ).digest()
+    
+    def _cache_audio(self, key: bytes, audio: bytes):
+        """Store synthesized audio, evicting least recently used clips over the limits."""
+        self._audio_cache[key] = audio
+        self._audio_cache_bytes += len(audio)
+        while (
+            len(self._audio_cache) > self.AUDIO_CACHE_SIZE
+            or self._audio_cache_bytes > self.AUDIO_CACHE_MAX_BYTES
+        ):
+            _, evicted = self._audio_cache.popitem(last=False)
+            self._audio_cache_bytes -= len(evicted)
     
     async def get_available_voices(self, locale_filter: str = "en") -> List[dict]:
         """
@@ -50,22 +78,37 @@ class TTSService:
             List of voice dictionaries
         """
         if self._voices_cache is None:
-            all_voices = await edge_tts.list_voices()
-            self._voices_cache = all_voices
+            await self.warmup()
         
-        voices = []
-        for voice in self._voices_cache:
-            if locale_filter and not voice["Locale"].startswith(locale_filter):
-                continue
-            
-            voices.append({
+        if not locale_filter:
+            return list(self._voices_cache)
+        
+        # Language codes ("en", "fi") are indexed; anything else ("en-GB") is a scan
+        if locale_filter in self._voices_by_language:
+            return list(self._voices_by_language[locale_filter])
+        
+        return [v for v in self._voices_cache if v["locale"].startswith(locale_filter)]
+    
+    async def warmup(self):
+        """Fetch the voice catalog and index it by language, ahead of the first request."""
+        voices = [
+            {
                 "name": voice["FriendlyName"],
                 "short_name": voice["ShortName"],
                 "locale": voice["Locale"],
                 "gender": voice["Gender"]
-            })
+            }
+            for voice in await edge_tts.list_voices()
+        ]
         
-        return voices
+        # Each language code maps to exactly what a prefix scan would return, in catalog
+        # order, so "fi" still matches "fil-PH" as well as "fi-FI"
+        languages = {v["locale"].split("-", 1)[0] for v in voices}
+        self._voices_by_language = {
+            language: [v for v in voices if v["locale"].startswith(language)]
+            for language in languages
+        }
+        self._voices_cache = voices
     
     async def synthesize(
         self,
@@ -90,6 +133,13 @@ class TTSService:
         rate = rate or self.default_rate
         volume = volume or self.default_volume
         
+        # Repeated prompts (greetings, status lines, replayed answers) skip the round-trip
+        cache_key = self._audio_cache_key(text, voice, rate, volume)
+        cached = self._audio_cache.get(cache_key)
+        if cached is not None:
+            self._audio_cache.move_to_end(cache_key)
+            return cached
+        
         try:
             communicate = edge_tts.Communicate(
                 text=text,
@@ -103,7 +153,10 @@ class TTSService:
                 if chunk["type"] == "audio":
                     audio_data.write(chunk["data"])
             
-            return audio_data.getvalue()
+            audio = audio_data.getvalue()
+            if audio:
+                self._cache_audio(cache_key, audio)
+            return audio
             
         except Exception as e:
             logger.error(f"TTS synthesis error: {e}")
@@ -5,13 +5,15 @@ Handles real-time audio streaming, transcription, and AI response generation.
 
 import asyncio
 import base64
-import json
 import logging
+import orjson
+import re
 from typing import Optional
 from fastapi import WebSocket, WebSocketDisconnect
 
-from services.transcription import transcription_service, convert_webm_to_pcm
+from services.transcription import transcription_service, WebMDecoder
 from services.ai_generator import ai_generator
+from services.tts_service import tts_service
 from services.cv_processor import cv_context_manager
 from models.database import create_session, end_session, add_qa
 
@@ -19,6 +21,21 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_SESSION = "default"
 
+# How much recent transcript to pass to Whisper as a prompt for the next chunk
+TRANSCRIPTION_PROMPT_CHARS = 200
+
+# Shown in place of an answer when generation fails, as ai_generator.generate_answer does
+ANSWER_FAILED_TEXT = "I apologize, but I couldn't generate an answer at this moment."
+
+# End of a sentence in a streamed answer: terminal punctuation followed by whitespace, or a newline
+_SENTENCE_END_RE = re.compile(r"[.!?]+(?=\s)|\n")
+
+# Words that typically open an interview question
+_STARTERS_RE = re.compile(
+    r"^(?:what|how|why|tell|describe|explain|can|could|would|do|does|have|where|when)\b",
+    re.IGNORECASE
+)
+
 
 class InterviewSession:
     """Manages state for a single interview WebSocket session."""
@@ -27,17 +44,72 @@ class InterviewSession:
         self.websocket = websocket
         self.db_session_id: Optional[int] = None
         self.audio_buffer = bytearray()
+        self.decoder: Optional[WebMDecoder] = None
+        self.decoder_failed = False
         self.transcription_buffer = ""
+        self.recent_transcript = ""
         self.last_question = ""
+        self.speak_answers = False
+        self.speaker: Optional[asyncio.Task] = None
         self.is_processing = False
         self.processing_lock = asyncio.Lock()
     
+    def _append_pcm(self, pcm_data: bytes):
+        """Decoder callback: append decoded PCM to the current audio buffer."""
+        self.audio_buffer.extend(pcm_data)
+    
+    async def feed_decoder(self, audio_bytes: bytes) -> bool:
+        """
+        Feed encoded audio to this session's ffmpeg decoder, starting it on first use.
+        
+        Returns False if the decoder is unavailable. After a failure the decoder
+        is not restarted until the next session: a new ffmpeg would only see the
+        middle of the WebM stream, without its header, and exit straight away.
+        """
+        if self.decoder_failed:
+            return False
+        
+        if self.decoder is None:
+            decoder = WebMDecoder(self._append_pcm)
+            try:
+                await decoder.start()
+            except FileNotFoundError:
+                logger.error("ffmpeg not found; audio can't be decoded")
+                self.decoder_failed = True
+                return False
+            self.decoder = decoder
+        
+        try:
+            await self.decoder.feed(audio_bytes)
+            return True
+        except ConnectionError:
+            logger.error("ffmpeg decoder exited unexpectedly; dropping audio until the next session")
+            self.decoder_failed = True
+            await self.close_decoder()
+            return False
+    
+    async def close_decoder(self):
+        """Stop the decoder, flushing any PCM it still holds into the audio buffer."""
+        if self.decoder:
+            decoder, self.decoder = self.decoder, None
+            await decoder.close()
+    
+    async def stop_speaking(self):
+        """Cancel the answer currently being spoken, if any."""
+        if self.speaker:
+            speaker, self.speaker = self.speaker, None
+            speaker.cancel()
+            try:
+                await speaker
+            except asyncio.CancelledError:
+                pass
+    
     async def send_message(self, msg_type: str, **data):
-        """Send a JSON message to the client."""
-        await self.websocket.send_json({
+        """Send a JSON message to the client as an orjson-encoded binary frame."""
+        await self.websocket.send_bytes(orjson.dumps({
             "type": msg_type,
             **data
-        })
+        }))
     
     async def send_error(self, message: str):
         """Send an error message to the client."""
@@ -53,36 +125,37 @@ async def handle_audio_websocket(websocket: WebSocket):
     Main WebSocket handler for interview audio streaming.
     
     Protocol:
-    - Client sends: {"type": "start_session"} to begin
-    - Client sends: {"type": "audio_chunk", "data": "<base64 audio>"} for audio
+    - Client sends: {"type": "start_session", "speak": bool} to begin; "speak" opts in to spoken answers
+    - Client sends: binary frames of WebM audio
+    - Client sends: {"type": "audio_chunk", "data": "<base64 audio>"} (legacy audio path)
     - Client sends: {"type": "end_session"} to finish
     - Server sends: {"type": "transcription", "text": "...", "is_final": bool}
     - Server sends: {"type": "ai_response", "text": "...", "key_points": [...], "is_complete": bool}
+    - Server sends: {"type": "audio_start"}, then {"type": "audio_chunk", "data": "<base64 MP3>"}
+      while speaking an answer, then {"type": "audio_end"} once it has all been sent
     """
     await websocket.accept()
     session = InterviewSession(websocket)
     
     logger.info("WebSocket connection established")
     
-    # Preload models
-    try:
-        await session.send_status("loading", "Loading transcription model...")
-        await transcription_service.load_model()
-        await session.send_status("ready", "Ready for audio")
-    except Exception as e:
-        logger.error(f"Failed to load models: {e}")
-        await session.send_error(f"Failed to load models: {str(e)}")
-        await websocket.close()
-        return
+    # Services are shared and warmed up at startup, so there is nothing to load per connection
+    await session.send_status("ready", "Ready for audio")
     
     try:
         while True:
-            # Receive message
-            raw_message = await websocket.receive_text()
+            # Receive message; binary frames carry audio, text frames carry JSON control messages
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            
+            if frame.get("bytes") is not None:
+                await handle_audio_bytes(session, frame["bytes"])
+                continue
             
             try:
-                message = json.loads(raw_message)
-            except json.JSONDecodeError:
+                message = orjson.loads(frame.get("text") or "")
+            except orjson.JSONDecodeError:
                 await session.send_error("Invalid JSON message")
                 continue
             
@@ -117,14 +190,18 @@ async def handle_audio_websocket(websocket: WebSocket):
             await session.send_error(str(e))
         except:
             pass
+    
+    finally:
+        await session.stop_speaking()
+        await session.close_decoder()
 
 
 async def handle_start_session(session: InterviewSession, message: dict):
     """Handle session start."""
     # Get CV context if available
     cv_context = cv_context_manager.get_context(DEFAULT_SESSION)
-    cv_filename = cv_context["filename"] if cv_context else None
-    cv_text = cv_context["text"] if cv_context else None
+    cv_filename = cv_context.filename if cv_context else None
+    cv_text = cv_context.text if cv_context else None
     
     # Create database session
     session.db_session_id = await create_session(
@@ -133,30 +210,44 @@ async def handle_start_session(session: InterviewSession, message: dict):
         cv_text=cv_text
     )
     
+    # A new recording starts a new WebM stream, so it needs a fresh decoder
+    await session.close_decoder()
+    session.decoder_failed = False
     session.audio_buffer = bytearray()
     session.transcription_buffer = ""
+    session.recent_transcript = ""
+    session.speak_answers = bool(message.get("speak"))
     
     await session.send_status("session_started", f"Session {session.db_session_id} started")
     logger.info(f"Started session {session.db_session_id}")
 
 
 async def handle_audio_chunk(session: InterviewSession, message: dict):
-    """Handle incoming audio chunk."""
+    """Handle a base64-encoded audio chunk sent inside a JSON message."""
     audio_b64 = message.get("data")
     
     if not audio_b64:
         return
     
     try:
-        # Decode base64 audio
         audio_bytes = base64.b64decode(audio_b64)
-        
-        # Convert from WebM if needed
-        pcm_data = convert_webm_to_pcm(audio_bytes)
-        if pcm_data:
-            session.audio_buffer.extend(pcm_data)
-        else:
-            session.audio_buffer.extend(audio_bytes)
+    except Exception as e:
+        logger.error(f"Error decoding audio chunk: {e}")
+        return
+    
+    await handle_audio_bytes(session, audio_bytes)
+
+
+async def handle_audio_bytes(session: InterviewSession, audio_bytes: bytes):
+    """Handle an incoming chunk of encoded audio."""
+    if not audio_bytes:
+        return
+    
+    try:
+        # Convert from WebM; decoded PCM is appended to the buffer as ffmpeg produces it.
+        # Undecodable audio is dropped: encoded bytes would be sent to Whisper as noise.
+        if not await session.feed_decoder(audio_bytes):
+            return
         
         # Process when we have enough audio (about 2 seconds)
         if len(session.audio_buffer) >= 64000:  # ~2 seconds at 16kHz, 16-bit
@@ -174,13 +265,21 @@ async def process_audio_buffer(session: InterviewSession):
         session.is_processing = True
     
     try:
-        audio_data = bytes(session.audio_buffer)
-        session.audio_buffer = bytearray()  # Clear buffer
+        # Take the filled buffer as-is and start a new one, rather than copying it
+        audio_data = session.audio_buffer
+        session.audio_buffer = bytearray()
         
         # Transcribe
-        text, confidence = await transcription_service.transcribe(audio_data)
+        # Adjacent chunks are transcribed separately; the preceding text keeps them consistent
+        text, confidence = await transcription_service.transcribe(
+            audio_data,
+            prompt=session.recent_transcript or None
+        )
         
         if text.strip():
+            session.recent_transcript = (
+                session.recent_transcript + " " + text
+            ).strip()[-TRANSCRIPTION_PROMPT_CHARS:]
             session.transcription_buffer += " " + text
             session.transcription_buffer = session.transcription_buffer.strip()
             
@@ -194,7 +293,7 @@ async def process_audio_buffer(session: InterviewSession):
             )
             
             # Check if this looks like a complete question
-            if await is_complete_question(session.transcription_buffer):
+            if is_complete_question(session.transcription_buffer):
                 question = session.transcription_buffer
                 session.transcription_buffer = ""
                 
@@ -215,7 +314,7 @@ async def process_audio_buffer(session: InterviewSession):
         session.is_processing = False
 
 
-async def is_complete_question(text: str) -> bool:
+def is_complete_question(text: str) -> bool:
     """Determine if the transcription appears to be a complete question."""
     text = text.strip()
     
@@ -228,31 +327,120 @@ async def is_complete_question(text: str) -> bool:
     
     # Check if it's long enough and has a natural pause indicator
     # (In production, you'd use VAD or silence detection)
-    word_count = len(text.split())
-    if word_count >= 10:
-        # Simple heuristic: looks like a complete thought
-        question_starters = ["what", "how", "why", "tell", "describe", "explain", "can", "could", "would", "do", "does", "have", "where", "when"]
-        first_word = text.lower().split()[0]
-        if first_word in question_starters:
-            return True
+    # Simple heuristic: ten or more words opening with a question word
+    if text.count(" ") >= 9 and _STARTERS_RE.match(text):
+        return True
     
     return False
 
 
+def _answer_text(response_text: str) -> str:
+    """The answer section of a partial LLM response, without the ANSWER:/KEY POINTS: markers."""
+    return response_text.split("KEY POINTS:", 1)[0].replace("ANSWER:", "").lstrip()
+
+
+async def speak_sentences(session: InterviewSession, sentences: asyncio.Queue):
+    """Synthesize queued sentences in order and stream the MP3 audio to the client."""
+    await session.send_message("audio_start")
+    while True:
+        sentence = await sentences.get()
+        if sentence is None:
+            await session.send_message("audio_end")
+            return
+        
+        try:
+            async for chunk in tts_service.synthesize_stream(sentence):
+                await session.send_message("audio_chunk", data=base64.b64encode(chunk).decode("ascii"))
+        except Exception as e:
+            logger.error(f"Error speaking answer: {e}")
+            return
+
+
+async def send_answer_failed(session: InterviewSession, question: str, message: str):
+    """Report a failed answer, closing out any partial ai_response already sent."""
+    await session.stop_speaking()
+    await session.send_error(message)
+    await session.send_message(
+        "ai_response",
+        question=question,
+        text=ANSWER_FAILED_TEXT,
+        key_points=[],
+        is_complete=True
+    )
+
+
 async def generate_and_send_answer(session: InterviewSession, question: str):
-    """Generate and stream AI answer to the client."""
+    """
+    Generate and stream AI answer to the client.
+    
+    The answer is sent sentence by sentence as the LLM produces it. If the
+    session asked for spoken answers, each sentence is also handed to TTS as
+    soon as it is complete, so audio starts before the answer is finished.
+    Speech runs in its own task and keeps going after this returns, so the
+    receive loop isn't held up; a new answer cuts off the previous one.
+    """
     await session.send_status("generating", "Generating answer...")
     
     # Get CV context
     cv_context = cv_context_manager.get_context(DEFAULT_SESSION)
-    cv_text = cv_context["summary"] if cv_context else None
+    cv_text = cv_context.summary if cv_context else None
+    
+    await session.stop_speaking()
+    sentences: Optional[asyncio.Queue] = None
+    if session.speak_answers:
+        sentences = asyncio.Queue()
+        session.speaker = asyncio.create_task(speak_sentences(session, sentences))
     
     try:
-        # Generate answer
-        answer, key_points = await ai_generator.generate_answer(
+        response_text = ""
+        sent_upto = 0  # End of the answer text already sent (and spoken)
+        stream_error = None
+        
+        async for text, is_complete in ai_generator.generate_answer_stream(
             question=question,
             cv_context=cv_text
-        )
+        ):
+            if is_complete:
+                # The final item only carries text when the stream failed
+                stream_error = text or None
+                break
+            response_text += text
+            
+            # Find the last sentence boundary in the text not yet sent
+            answer_so_far = _answer_text(response_text)
+            boundary = None
+            for boundary in _SENTENCE_END_RE.finditer(answer_so_far, sent_upto):
+                pass
+            if boundary is None:
+                continue
+            
+            sentence = answer_so_far[sent_upto:boundary.end()].strip()
+            sent_upto = boundary.end()
+            if not sentence:
+                continue
+            
+            if sentences is not None:
+                sentences.put_nowait(sentence)
+            await session.send_message(
+                "ai_response",
+                question=question,
+                text=answer_so_far[:sent_upto].strip(),
+                key_points=[],
+                is_complete=False
+            )
+        
+        if stream_error:
+            # Don't speak or save the error as if it were part of the answer
+            await send_answer_failed(session, question, stream_error)
+            return
+        
+        answer, key_points = ai_generator.parse_response(response_text)
+        
+        # Speak whatever followed the last sentence boundary
+        if sentences is not None:
+            remainder = _answer_text(response_text)[sent_upto:].strip()
+            if remainder:
+                sentences.put_nowait(remainder)
         
         # Send complete answer
         await session.send_message(
@@ -276,12 +464,18 @@ async def generate_and_send_answer(session: InterviewSession, question: str):
         
     except Exception as e:
         logger.error(f"Error generating answer: {e}")
-        await session.send_error(f"Failed to generate answer: {str(e)}")
+        await send_answer_failed(session, question, f"Failed to generate answer: {str(e)}")
+    
+    finally:
+        # Let the speaker finish the queued sentences on its own
+        if sentences is not None:
+            sentences.put_nowait(None)
 
 
 async def handle_end_session(session: InterviewSession):
     """Handle session end."""
-    # Process any remaining audio
+    # Drain the decoder, then process any remaining audio
+    await session.close_decoder()
     if len(session.audio_buffer) > 1000:
         await process_audio_buffer(session)
     
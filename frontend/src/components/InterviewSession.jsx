@@ -119,7 +119,7 @@ function InterviewSession({ settings, onExit }) {
             await audioCapture.requestAccess(AudioSourceType.TAB);
 
             // Start the interview session
-            await startInterview();
+            await startInterview({ speak: settings.speakAnswers });
 
             // Session is now active
             setSessionState(SessionState.ACTIVE);
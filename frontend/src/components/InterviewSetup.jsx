@@ -40,6 +40,7 @@ function InterviewSetup({ isOpen, onClose, onStart }) {
         extraInstructions: '',
         resumeFile: null,
         autoGenerate: true,
+        speakAnswers: false,
     });
     const [isUploading, setIsUploading] = useState(false);
     const [uploadError, setUploadError] = useState(null);
@@ -366,6 +367,25 @@ function InterviewSetup({ isOpen, onClose, onStart }) {
                                 </label>
                             </div>
 
+                            <div className="form-group toggle-group">
+                                <label className="toggle-label">
+                                    <span>Speak AI Responses</span>
+                                    <span className="optional-tag">Optional</span>
+                                </label>
+                                <p className="form-hint">
+                                    If enabled, answers are read aloud as they are generated,
+                                    starting with the first sentence.
+                                </p>
+                                <label className="toggle">
+                                    <input
+                                        type="checkbox"
+                                        checked={formData.speakAnswers}
+                                        onChange={(e) => updateForm('speakAnswers', e.target.checked)}
+                                    />
+                                    <span className="toggle-slider"></span>
+                                </label>
+                            </div>
+
                             {/* Summary */}
                             <div className="setup-summary">
                                 <h4>Summary</h4>
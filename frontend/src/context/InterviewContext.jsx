@@ -6,6 +6,7 @@
 import { createContext, useContext, useState, useCallback, useEffect } from 'react';
 import { cvApi, checkHealth } from '../services/api';
 import { useWebSocket, WebSocketStatus } from '../hooks/useWebSocket';
+import { useAudioStream } from '../hooks/useAudioStream';
 
 const InterviewContext = createContext(null);
 
@@ -39,6 +40,9 @@ export function InterviewProvider({ children }) {
     // WebSocket
     const ws = useWebSocket();
 
+    // Spoken answers streamed over the WebSocket
+    const audioStream = useAudioStream();
+
     // Check backend health on mount
     useEffect(() => {
         const check = async () => {
@@ -84,6 +88,11 @@ export function InterviewProvider({ children }) {
             });
         });
 
+        // Spoken answer handlers
+        const unsubAudioStart = ws.onMessage('audio_start', () => audioStream.start());
+        const unsubAudioChunk = ws.onMessage('audio_chunk', (msg) => audioStream.append(msg.data));
+        const unsubAudioEnd = ws.onMessage('audio_end', () => audioStream.end());
+
         // Status handler
         const unsubStatus = ws.onMessage('status', (msg) => {
             console.log('Status:', msg.status, msg.message);
@@ -102,10 +111,13 @@ export function InterviewProvider({ children }) {
         return () => {
             unsubTranscription();
             unsubAiResponse();
+            unsubAudioStart();
+            unsubAudioChunk();
+            unsubAudioEnd();
             unsubStatus();
             unsubError();
         };
-    }, [ws.isConnected, ws.onMessage]);
+    }, [ws.isConnected, ws.onMessage, audioStream.start, audioStream.append, audioStream.end]);
 
     // Load CV context from backend
     const loadCvContext = useCallback(async () => {
@@ -155,7 +167,7 @@ export function InterviewProvider({ children }) {
     }, []);
 
     // Start interview session
-    const startInterview = useCallback(async () => {
+    const startInterview = useCallback(async (options = {}) => {
         // Connect WebSocket if not connected
         if (!ws.isConnected) {
             ws.connect();
@@ -164,7 +176,7 @@ export function InterviewProvider({ children }) {
         }
 
         // Start session
-        ws.startSession();
+        ws.startSession(options);
         setTranscription('');
         setInterimTranscription('');
         setAiResponse({ question: '', answer: '', keyPoints: [], isGenerating: false });
@@ -173,8 +185,9 @@ export function InterviewProvider({ children }) {
     // End interview session
     const endInterview = useCallback(() => {
         ws.endSession();
+        audioStream.stop();
         setSessionActive(false);
-    }, [ws]);
+    }, [ws, audioStream.stop]);
 
     // Clear current session data
     const clearSession = useCallback(() => {
@@ -222,6 +235,8 @@ export function InterviewProvider({ children }) {
         // AI Response
         aiResponse,
         requestAnswer,
+        isSpeaking: audioStream.isPlaying,
+        stopSpeaking: audioStream.stop,
     };
 
     return (
@@ -167,15 +167,10 @@ export function useAudioCapture({ onAudioChunk, chunkIntervalMs = 500 }) {
             const mediaRecorder = new MediaRecorder(combinedStreamRef.current, options);
             mediaRecorderRef.current = mediaRecorder;
 
-            mediaRecorder.ondataavailable = async (event) => {
+            mediaRecorder.ondataavailable = (event) => {
                 if (event.data.size > 0 && onAudioChunk) {
-                    // Convert blob to base64
-                    const reader = new FileReader();
-                    reader.onloadend = () => {
-                        const base64 = reader.result.split(',')[1];
-                        onAudioChunk(base64);
-                    };
-                    reader.readAsDataURL(event.data);
+                    // Hand over the raw blob; it is sent as a binary WebSocket frame
+                    onAudioChunk(event.data);
                 }
             };
 
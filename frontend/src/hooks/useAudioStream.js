@@ -0,0 +1,134 @@
+/**
+ * useAudioStream Hook
+ * Plays MP3 audio that arrives in chunks, starting before the last chunk is in.
+ */
+
+import { useState, useCallback, useRef, useEffect } from 'react';
+
+const MP3_MIME = 'audio/mpeg';
+
+// Decode a base64 string into bytes
+function base64ToBytes(base64) {
+    const binary = atob(base64);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes;
+}
+
+// MediaSource lets playback start on the first chunk; without it the clip is played once complete
+const canStream = () => Boolean(window.MediaSource?.isTypeSupported(MP3_MIME));
+
+export function useAudioStream() {
+    const [isPlaying, setIsPlaying] = useState(false);
+
+    const audioRef = useRef(null);
+    const audioUrlRef = useRef(null);
+    const mediaSourceRef = useRef(null);
+    const sourceBufferRef = useRef(null);
+    const pendingRef = useRef([]); // Chunks not yet handed to the SourceBuffer (or the whole clip)
+    const endedRef = useRef(false);
+
+    // Feed queued chunks into the SourceBuffer, one append at a time
+    const pump = useCallback(() => {
+        const sourceBuffer = sourceBufferRef.current;
+        if (!sourceBuffer || sourceBuffer.updating) return;
+
+        if (pendingRef.current.length > 0) {
+            sourceBuffer.appendBuffer(pendingRef.current.shift());
+        } else if (endedRef.current && mediaSourceRef.current?.readyState === 'open') {
+            mediaSourceRef.current.endOfStream();
+        }
+    }, []);
+
+    // Play audio from an object URL
+    const play = useCallback((url) => {
+        audioUrlRef.current = url;
+
+        const audio = new Audio(url);
+        audioRef.current = audio;
+
+        audio.onplaying = () => setIsPlaying(true);
+        audio.onended = () => {
+            if (audioRef.current === audio) setIsPlaying(false);
+        };
+        audio.onerror = (e) => {
+            console.error('Streamed audio playback error:', e);
+            if (audioRef.current === audio) setIsPlaying(false);
+        };
+
+        audio.play().catch((err) => console.error('Failed to play streamed audio:', err));
+    }, []);
+
+    // Stop playback and drop anything still queued
+    const stop = useCallback(() => {
+        if (audioRef.current) {
+            audioRef.current.pause();
+            audioRef.current = null;
+        }
+        if (audioUrlRef.current) {
+            URL.revokeObjectURL(audioUrlRef.current);
+            audioUrlRef.current = null;
+        }
+        mediaSourceRef.current = null;
+        sourceBufferRef.current = null;
+        pendingRef.current = [];
+        endedRef.current = false;
+        setIsPlaying(false);
+    }, []);
+
+    // Begin a new clip, cutting off the previous one
+    const start = useCallback(() => {
+        stop();
+        if (!canStream()) return;
+
+        const mediaSource = new MediaSource();
+        mediaSourceRef.current = mediaSource;
+
+        mediaSource.addEventListener('sourceopen', () => {
+            if (mediaSourceRef.current !== mediaSource) return;
+            const sourceBuffer = mediaSource.addSourceBuffer(MP3_MIME);
+            sourceBuffer.addEventListener('updateend', pump);
+            sourceBufferRef.current = sourceBuffer;
+            pump();
+        }, { once: true });
+
+        play(URL.createObjectURL(mediaSource));
+    }, [stop, pump, play]);
+
+    // Queue a base64-encoded MP3 chunk
+    const append = useCallback((base64Audio) => {
+        pendingRef.current.push(base64ToBytes(base64Audio));
+        pump();
+    }, [pump]);
+
+    // Mark the clip complete
+    const end = useCallback(() => {
+        endedRef.current = true;
+
+        if (mediaSourceRef.current) {
+            pump();
+            return;
+        }
+
+        if (pendingRef.current.length > 0) {
+            const blob = new Blob(pendingRef.current, { type: MP3_MIME });
+            pendingRef.current = [];
+            play(URL.createObjectURL(blob));
+        }
+    }, [pump, play]);
+
+    // Cleanup on unmount
+    useEffect(() => stop, [stop]);
+
+    return {
+        isPlaying,
+        start,
+        append,
+        end,
+        stop,
+    };
+}
+
+export default useAudioStream;
@@ -13,6 +13,9 @@ export const WebSocketStatus = {
     ERROR: 'error',
 };
 
+// Server messages arrive as UTF-8 JSON in binary frames
+const textDecoder = new TextDecoder();
+
 export function useWebSocket() {
     const [status, setStatus] = useState(WebSocketStatus.DISCONNECTED);
     const [lastMessage, setLastMessage] = useState(null);
@@ -41,6 +44,7 @@ export function useWebSocket() {
 
         try {
             const ws = new WebSocket(getWebSocketUrl());
+            ws.binaryType = 'arraybuffer';
             wsRef.current = ws;
 
             ws.onopen = () => {
@@ -51,7 +55,10 @@ export function useWebSocket() {
 
             ws.onmessage = (event) => {
                 try {
-                    const message = JSON.parse(event.data);
+                    const raw = typeof event.data === 'string'
+                        ? event.data
+                        : textDecoder.decode(event.data);
+                    const message = JSON.parse(raw);
                     setLastMessage(message);
 
                     // Call registered handler for this message type
@@ -126,9 +133,9 @@ export function useWebSocket() {
         }
     }, []);
 
-    // Start interview session
-    const startSession = useCallback(() => {
-        return send('start_session');
+    // Start interview session; speak asks the server to stream spoken answers
+    const startSession = useCallback(({ speak = false } = {}) => {
+        return send('start_session', { speak });
     }, [send]);
 
     // End interview session
@@ -136,10 +143,21 @@ export function useWebSocket() {
         return send('end_session');
     }, [send]);
 
-    // Send audio chunk
-    const sendAudioChunk = useCallback((base64Audio) => {
-        return send('audio_chunk', { data: base64Audio });
-    }, [send]);
+    // Send audio chunk (Blob or ArrayBuffer) as a binary frame, skipping base64 and JSON
+    const sendAudioChunk = useCallback((audio) => {
+        if (wsRef.current?.readyState !== WebSocket.OPEN) {
+            console.warn('WebSocket not connected, cannot send audio');
+            return false;
+        }
+
+        try {
+            wsRef.current.send(audio);
+            return true;
+        } catch (err) {
+            console.error('Failed to send audio chunk:', err);
+            return false;
+        }
+    }, []);
 
     // Request answer generation
     const generateAnswer = useCallback((question) => {